@@ -6,11 +6,13 @@ via the Fewsats API. It implements the MCP stdio transport protocol for seamless
 with MCP clients.
 """
 
-import json
+import orjson
+import fastjsonschema
 from typing import Any, Dict, List
 import asyncio
 import sys
 import os
+import httpx
 from dotenv import load_dotenv
 
 from mcp.server.stdio import stdio_server
@@ -24,6 +26,112 @@ from mcp.types import (
 from fewsats.core import Fewsats
 
 
+# Fragments repeated across the schemas below; interning the type names and
+# sharing the enum gives the schema dicts a single copy of each value.
+_STR = sys.intern("string")
+_OBJ = sys.intern("object")
+_NUM = sys.intern("number")
+_ARR = sys.intern("array")
+_CHAIN_ENUM = ("base-sepolia", "base")
+
+# Input schemas for the tools below, hoisted to module scope so they are
+# built once at import time and shared by the Tool definitions and the
+# compiled validators.
+_EMPTY_SCHEMA = {
+    "type": _OBJ,
+    "properties": {}
+}
+
+_PAY_OFFER_SCHEMA = {
+    "type": _OBJ,
+    "properties": {
+        "offer_id": {
+            "type": _STR,
+            "description": "String identifier for the offer to pay"
+        },
+        "l402_offer": {
+            "type": _OBJ,
+            "description": "L402 offer object with structure containing offers array, payment_context_token, payment_request_url, and version",
+            "properties": {
+                "offers": {
+                    "type": _ARR,
+                    "items": {
+                        "type": _OBJ,
+                        "properties": {
+                            "id": {"type": _STR, "description": "String identifier for the offer"},
+                            "amount": {"type": _NUM, "description": "Numeric cost value"},
+                            "currency": {"type": _STR, "description": "Currency code"},
+                            "description": {"type": _STR, "description": "Text description"},
+                            "title": {"type": _STR, "description": "Title of the package"}
+                        },
+                        "required": ["id", "amount", "currency"]
+                    }
+                },
+                "payment_context_token": {"type": _STR, "description": "Payment context token"},
+                "payment_request_url": {"type": _STR, "description": "Payment URL"},
+                "version": {"type": _STR, "description": "API version"}
+            },
+            "required": ["offers", "payment_context_token", "payment_request_url", "version"]
+        }
+    },
+    "required": ["offer_id", "l402_offer"]
+}
+
+_PAYMENT_INFO_SCHEMA = {
+    "type": _OBJ,
+    "properties": {
+        "pid": {"type": _STR, "description": "Payment ID to retrieve information for"}
+    },
+    "required": ["pid"]
+}
+
+_X402_PAYMENT_HEADER_SCHEMA = {
+    "type": _OBJ,
+    "properties": {
+        "chain": {
+            "type": _STR,
+            "enum": _CHAIN_ENUM,
+            "description": "Blockchain network to use for payment"
+        },
+        "x402_payload": {
+            "type": _OBJ,
+            "description": "X402 payload object with accepts array and protocol details",
+            "properties": {
+                "accepts": {
+                    "type": _ARR,
+                    "items": {
+                        "type": _OBJ,
+                        "properties": {
+                            "asset": {"type": _STR, "description": "Asset contract address"},
+                            "description": {"type": _STR, "description": "Payment description"},
+                            "extra": {
+                                "type": _OBJ,
+                                "properties": {
+                                    "name": {"type": _STR},
+                                    "version": {"type": _STR}
+                                }
+                            },
+                            "maxAmountRequired": {"type": _STR, "description": "Maximum amount required"},
+                            "maxTimeoutSeconds": {"type": _NUM, "description": "Maximum timeout in seconds"},
+                            "mimeType": {"type": _STR, "description": "MIME type"},
+                            "network": {"type": _STR, "description": "Network identifier"},
+                            "payTo": {"type": _STR, "description": "Payment recipient address"},
+                            "resource": {"type": _STR, "description": "Resource URL"},
+                            "scheme": {"type": _STR, "description": "Payment scheme"}
+                        },
+                        "required": ["asset", "network", "payTo", "resource"]
+                    }
+                },
+                "error": {"type": _STR, "description": "Error message"},
+                "x402Version": {"type": _NUM, "description": "X402 protocol version"}
+            },
+            "required": ["accepts", "x402Version"]
+        }
+    },
+    "required": ["chain", "x402_payload"]
+}
+
+
 class FewsatsMCPServer:
     """MCP Server for Fewsats payment integration using proper MCP patterns."""
     
@@ -34,178 +142,136 @@ class FewsatsMCPServer:
         
         self.server = Server("fewsats-mcp")
         self.fewsats = Fewsats()
+
+        # Fewsats keeps one httpx.Client for its lifetime; swap in a client
+        # tuned for connection reuse so repeated tool calls share the same
+        # TCP+TLS session instead of paying a handshake per request.
+        pooled_client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+            headers=self.fewsats._httpx_client.headers,
+        )
+        self.fewsats._httpx_client.close()
+        self.fewsats._httpx_client = pooled_client
+
+        self._init_options = None
         self._setup_tools()
     
     def _handle_response(self, response):
-        """Helper method to handle API responses consistently."""
-        try: 
-            return response.status_code, response.json()
-        except: 
-            return response.status_code, response.text
+        """Helper method to handle API responses consistently.
+
+        Returns a (status_code, body, body_is_json) tuple. JSON bodies pass
+        through as raw bytes so call_tool can splice them into its output
+        without a parse/re-serialize round trip.
+        """
+        body = response.content
+        if body and "application/json" in response.headers.get("content-type", ""):
+            try:
+                # Well-formedness check only; the raw bytes are what gets
+                # returned, so the server's formatting is preserved and no
+                # re-serialize happens. Empty or malformed bodies fall
+                # through to the string path below.
+                orjson.loads(body)
+                return response.status_code, body, True
+            except orjson.JSONDecodeError:
+                pass
+        try:
+            return response.status_code, response.json(), False
+        except ValueError:
+            return response.status_code, response.text, False
     
     def _setup_tools(self):
         """Setup all available tools with their schemas."""
-        
+
+        # Build the tool list once; it is static, so every list_tools request
+        # can return the same objects instead of reconstructing them.
+        self._tools = [
+            # Wallet Management Tools
+            Tool(
+                name="balance",
+                description="Retrieve the balance of the user's wallet. You will rarely need to call this unless instructed by the user, or to troubleshoot payment issues. Fewsats will automatically add balance when needed.",
+                inputSchema=_EMPTY_SCHEMA
+            ),
+            Tool(
+                name="payment_methods",
+                description="Retrieve the user's payment methods. You will rarely need to call this unless instructed by the user, or to troubleshoot payment issues. Fewsats will automatically select the best payment method.",
+                inputSchema=_EMPTY_SCHEMA
+            ),
+            Tool(
+                name="billing_info",
+                description="Retrieve the user's billing information. Returns billing details including name, address, and other relevant information. This information can also be used as shipping address for purchases.",
+                inputSchema=_EMPTY_SCHEMA
+            ),
+            
+            # Payment Processing Tools
+            Tool(
+                name="pay_offer",
+                description="Pays an offer_id from the l402_offers. If payment status is 'needs_review' inform the user he will have to approve it at app.fewsats.com",
+                inputSchema=_PAY_OFFER_SCHEMA
+            ),
+            Tool(
+                name="payment_info",
+                description="Retrieve the details of a payment. If payment status is 'needs_review' inform the user he will have to approve it at app.fewsats.com",
+                inputSchema=_PAYMENT_INFO_SCHEMA
+            ),
+            
+            # X402 Protocol Tools
+            Tool(
+                name="create_x402_payment_header",
+                description="Creates a payment header for the X402 protocol. Returns a dict with the payment_header field that must be set in X-PAYMENT header in a x402 http request.",
+                inputSchema=_X402_PAYMENT_HEADER_SCHEMA
+            )
+        ]
+
+        # Compile each tool's input schema once at startup; the generated
+        # validator functions are far cheaper than re-interpreting the raw
+        # schema dicts on every tool call.
+        self._validators = {
+            tool.name: fastjsonschema.compile(tool.inputSchema)
+            for tool in self._tools
+        }
+
+        # Map tool names to handlers once; call_tool resolves a tool with a
+        # single dict lookup instead of walking an if/elif chain. The SDK
+        # calls are synchronous, so each handler off-loads to a worker thread
+        # to keep the event loop free while the HTTP request is in flight.
+        self._dispatch = {
+            "balance": lambda args: asyncio.to_thread(self.fewsats.balance),
+            "payment_methods": lambda args: asyncio.to_thread(self.fewsats.payment_methods),
+            "billing_info": lambda args: asyncio.to_thread(self.fewsats.billing_info),
+            "pay_offer": lambda args: asyncio.to_thread(self.fewsats.pay_offer, args["offer_id"], args["l402_offer"]),
+            "payment_info": lambda args: asyncio.to_thread(self.fewsats.payment_info, args["pid"]),
+            "create_x402_payment_header": lambda args: asyncio.to_thread(self.fewsats.pay_x402_offer, args["x402_payload"], args["chain"]),
+        }
+
         @self.server.list_tools()
         async def list_tools() -> List[Tool]:
             """List all available tools."""
-            return [
-                # Wallet Management Tools
-                Tool(
-                    name="balance",
-                    description="Retrieve the balance of the user's wallet. You will rarely need to call this unless instructed by the user, or to troubleshoot payment issues. Fewsats will automatically add balance when needed.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
-                ),
-                Tool(
-                    name="payment_methods",
-                    description="Retrieve the user's payment methods. You will rarely need to call this unless instructed by the user, or to troubleshoot payment issues. Fewsats will automatically select the best payment method.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
-                ),
-                Tool(
-                    name="billing_info",
-                    description="Retrieve the user's billing information. Returns billing details including name, address, and other relevant information. This information can also be used as shipping address for purchases.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {}
-                    }
-                ),
-                
-                # Payment Processing Tools
-                Tool(
-                    name="pay_offer",
-                    description="Pays an offer_id from the l402_offers. If payment status is 'needs_review' inform the user he will have to approve it at app.fewsats.com",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "offer_id": {
-                                "type": "string", 
-                                "description": "String identifier for the offer to pay"
-                            },
-                            "l402_offer": {
-                                "type": "object",
-                                "description": "L402 offer object with structure containing offers array, payment_context_token, payment_request_url, and version",
-                                "properties": {
-                                    "offers": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "object",
-                                            "properties": {
-                                                "id": {"type": "string", "description": "String identifier for the offer"},
-                                                "amount": {"type": "number", "description": "Numeric cost value"},
-                                                "currency": {"type": "string", "description": "Currency code"},
-                                                "description": {"type": "string", "description": "Text description"},
-                                                "title": {"type": "string", "description": "Title of the package"}
-                                            },
-                                            "required": ["id", "amount", "currency"]
-                                        }
-                                    },
-                                    "payment_context_token": {"type": "string", "description": "Payment context token"},
-                                    "payment_request_url": {"type": "string", "description": "Payment URL"},
-                                    "version": {"type": "string", "description": "API version"}
-                                },
-                                "required": ["offers", "payment_context_token", "payment_request_url", "version"]
-                            }
-                        },
-                        "required": ["offer_id", "l402_offer"]
-                    }
-                ),
-                Tool(
-                    name="payment_info",
-                    description="Retrieve the details of a payment. If payment status is 'needs_review' inform the user he will have to approve it at app.fewsats.com",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "pid": {"type": "string", "description": "Payment ID to retrieve information for"}
-                        },
-                        "required": ["pid"]
-                    }
-                ),
-                
-                # X402 Protocol Tools
-                Tool(
-                    name="create_x402_payment_header",
-                    description="Creates a payment header for the X402 protocol. Returns a dict with the payment_header field that must be set in X-PAYMENT header in a x402 http request.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "chain": {
-                                "type": "string", 
-                                "enum": ["base-sepolia", "base"],
-                                "description": "Blockchain network to use for payment"
-                            },
-                            "x402_payload": {
-                                "type": "object",
-                                "description": "X402 payload object with accepts array and protocol details",
-                                "properties": {
-                                    "accepts": {
-                                        "type": "array",
-                                        "items": {
-                                            "type": "object",
-                                            "properties": {
-                                                "asset": {"type": "string", "description": "Asset contract address"},
-                                                "description": {"type": "string", "description": "Payment description"},
-                                                "extra": {
-                                                    "type": "object",
-                                                    "properties": {
-                                                        "name": {"type": "string"},
-                                                        "version": {"type": "string"}
-                                                    }
-                                                },
-                                                "maxAmountRequired": {"type": "string", "description": "Maximum amount required"},
-                                                "maxTimeoutSeconds": {"type": "number", "description": "Maximum timeout in seconds"},
-                                                "mimeType": {"type": "string", "description": "MIME type"},
-                                                "network": {"type": "string", "description": "Network identifier"},
-                                                "payTo": {"type": "string", "description": "Payment recipient address"},
-                                                "resource": {"type": "string", "description": "Resource URL"},
-                                                "scheme": {"type": "string", "description": "Payment scheme"}
-                                            },
-                                            "required": ["asset", "network", "payTo", "resource"]
-                                        }
-                                    },
-                                    "error": {"type": "string", "description": "Error message"},
-                                    "x402Version": {"type": "number", "description": "X402 protocol version"}
-                                },
-                                "required": ["accepts", "x402Version"]
-                            }
-                        },
-                        "required": ["chain", "x402_payload"]
-                    }
-                )
-            ]
-        
+            return self._tools
+
         @self.server.call_tool()
         async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
             """Execute a tool with the given arguments."""
             try:
-                # Route the tool call to the appropriate function
-                if name == "balance":
-                    result = self._handle_response(self.fewsats.balance())
-                elif name == "payment_methods":
-                    result = self._handle_response(self.fewsats.payment_methods())
-                elif name == "billing_info":
-                    result = self._handle_response(self.fewsats.billing_info())
-                elif name == "pay_offer":
-                    offer_id = arguments["offer_id"]
-                    l402_offer = arguments["l402_offer"]
-                    result = self._handle_response(self.fewsats.pay_offer(offer_id, l402_offer))
-                elif name == "payment_info":
-                    pid = arguments["pid"]
-                    result = self._handle_response(self.fewsats.payment_info(pid))
-                elif name == "create_x402_payment_header":
-                    chain = arguments["chain"]
-                    x402_payload = arguments["x402_payload"]
-                    result = self._handle_response(self.fewsats.pay_x402_offer(x402_payload, chain))
-                else:
+                handler = self._dispatch.get(name)
+                if handler is None:
                     raise ValueError(f"Unknown tool: {name}")
-                
-                # Return the result as TextContent
-                return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+
+                # Validate arguments against the precompiled schema before
+                # calling; failures flow into the error branch below.
+                self._validators[name](arguments)
+
+                status_code, body, body_is_json = self._handle_response(await handler(arguments))
+
+                # Return the result as TextContent; JSON bodies are spliced
+                # in verbatim, keeping the server's exact formatting. Compact
+                # encoding keeps the copy count minimal for large responses --
+                # TextContent only accepts str, so one decode is unavoidable.
+                if body_is_json:
+                    text = '[%d, %s]' % (status_code, body.decode())
+                else:
+                    text = orjson.dumps((status_code, body), default=str).decode()
+                return [TextContent(type="text", text=text)]
                 
             except Exception as e:
                 # Return error information
@@ -214,17 +280,27 @@ class FewsatsMCPServer:
                     "tool": name,
                     "arguments": arguments
                 }
-                return [TextContent(type="text", text=json.dumps(error_result, indent=2))]
+                # Compact encoding keeps the error path cheap even when the
+                # echoed arguments are large payloads.
+                return [TextContent(type="text", text=orjson.dumps(error_result, default=str).decode())]
     
     async def run(self):
         """Run the MCP server using stdio transport."""
+        # Initialization options are static, so build them on the first run
+        # and reuse them across reconnects.
+        if self._init_options is None:
+            self._init_options = self.server.create_initialization_options()
         async with stdio_server() as (read_stream, write_stream):
             await self.server.run(
-                read_stream, 
-                write_stream, 
-                self.server.create_initialization_options()
+                read_stream,
+                write_stream,
+                self._init_options
             )
 
+    def close(self):
+        """Release the pooled HTTP client."""
+        self.fewsats._httpx_client.close()
+
 
 def main():
     """Main entry point for the MCP server."""
@@ -247,6 +323,14 @@ def main():
         print("The server communicates via stdin/stdout using the MCP protocol.")
         return
     
+    # Use uvloop's libuv-based event loop when available; fall back to the
+    # stdlib loop on platforms where it is not (e.g. Windows).
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     # Create and run the server
     server = FewsatsMCPServer()
     try:
@@ -256,6 +340,8 @@ def main():
     except Exception as e:
         print(f"Server error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        server.close()
 
 
 if __name__ == "__main__":